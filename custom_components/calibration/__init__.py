@@ -1,7 +1,13 @@
 """The Calibration integration."""
 
+import hashlib
+import json
 import logging
+import math
+from collections.abc import Callable
+from typing import Any
 
+import numpy as np
 import voluptuous as vol
 from homeassistant.components.sensor.const import (
     CONF_STATE_CLASS,
@@ -21,11 +27,15 @@ from homeassistant.helpers.discovery import async_load_platform
 from homeassistant.helpers.typing import ConfigType
 from numpy.polynomial import Polynomial
 from scipy.interpolate import CubicSpline
+from scipy.optimize import curve_fit
 
 from .const import (
     CONF_CALIBRATION,
+    CONF_CONSTANTS,
     CONF_DATAPOINTS,
     CONF_DEGREE,
+    CONF_EXPRESSION,
+    CONF_FINGERPRINT,
     CONF_HIDE_SOURCE,
     CONF_POLYNOMIAL,
     CONF_PRECISION,
@@ -37,12 +47,21 @@ from .const import (
     VALID_METHODS,
     DOMAIN,
 )
+from .expression import compile_expression, parse_expression
 
 _LOGGER = logging.getLogger(__name__)
 
 
 def datapoints_greater_than_degree(value: dict) -> dict:
     """Validate data point list is greater than polynomial degrees."""
+    if value[CONF_METHOD] == "expression":
+        return value
+
+    if CONF_DATAPOINTS not in value:
+        raise vol.RequiredFieldInvalid(
+            "required key not provided", path=[CONF_DATAPOINTS]
+        )
+
     if len(value[CONF_DATAPOINTS]) <= value[CONF_DEGREE]:
         raise vol.Invalid(
             f"{CONF_DATAPOINTS} must have at least {value[CONF_DEGREE]+1} {CONF_DATAPOINTS}"
@@ -51,6 +70,83 @@ def datapoints_greater_than_degree(value: dict) -> dict:
     return value
 
 
+def valid_expression(value: Any) -> str:
+    """Validate an expression is safe arithmetic in x."""
+    value = cv.string(value)
+    try:
+        parse_expression(value)
+    except ValueError as err:
+        raise vol.Invalid(f"invalid {CONF_EXPRESSION}: {err}") from err
+
+    return value
+
+
+def expression_matches_constants(value: dict) -> dict:
+    """Validate expression names and data points for the expression method."""
+    if value[CONF_METHOD] != "expression":
+        for key in (CONF_EXPRESSION, CONF_CONSTANTS):
+            if key in value:
+                raise vol.Invalid(f"{key} is only valid for {CONF_METHOD} expression")
+        return value
+
+    if CONF_EXPRESSION not in value:
+        raise vol.Invalid(f"{CONF_EXPRESSION} is required for {CONF_METHOD} expression")
+
+    constants = value.get(CONF_CONSTANTS, {})
+    datapoints = value.get(CONF_DATAPOINTS, [])
+
+    if datapoints and not constants:
+        raise vol.Invalid(
+            f"{CONF_DATAPOINTS} requires {CONF_CONSTANTS} to fit "
+            f"for {CONF_METHOD} expression"
+        )
+
+    if datapoints and len(datapoints) < len(constants):
+        raise vol.Invalid(
+            f"{CONF_DATAPOINTS} must have at least {len(constants)} {CONF_DATAPOINTS}"
+        )
+
+    try:
+        func = compile_expression(value[CONF_EXPRESSION], constants=constants)
+    except ValueError as err:
+        raise vol.Invalid(f"invalid {CONF_EXPRESSION}: {err}") from err
+
+    # Evaluate once so mistakes surface now instead of on every update
+    for x, _ in datapoints or [(1.0, None)]:
+        try:
+            result = func(x)
+        except (ValueError, ArithmeticError):
+            # Domain errors depend on x and are reported when evaluated
+            continue
+        except TypeError as err:
+            raise vol.Invalid(f"invalid {CONF_EXPRESSION}: {err}") from err
+        if (
+            isinstance(result, bool)
+            or not isinstance(result, (int, float))
+            or not math.isfinite(result)
+        ):
+            raise vol.Invalid(
+                f"invalid {CONF_EXPRESSION}: result for x={x} is not a real number"
+            )
+
+    return value
+
+
+def calibration_fingerprint(conf: dict) -> str:
+    """Return a fingerprint of the settings that determine the calibrated value."""
+    model = {
+        CONF_SOURCE: conf[CONF_SOURCE],
+        CONF_ATTRIBUTE: conf.get(CONF_ATTRIBUTE),
+        CONF_METHOD: conf[CONF_METHOD],
+        CONF_DEGREE: conf[CONF_DEGREE],
+        CONF_PRECISION: conf[CONF_PRECISION],
+        CONF_DATAPOINTS: sorted(conf.get(CONF_DATAPOINTS, [])),
+        CONF_EXPRESSION: conf.get(CONF_EXPRESSION),
+        CONF_CONSTANTS: conf.get(CONF_CONSTANTS),
+    }
+    return hashlib.sha256(json.dumps(model, sort_keys=True).encode()).hexdigest()
+
+
 CALIBRATION_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_SOURCE): cv.entity_id,
@@ -60,7 +156,7 @@ CALIBRATION_SCHEMA = vol.Schema(
         vol.Optional(CONF_DEVICE_CLASS): DEVICE_CLASSES_SCHEMA,
         vol.Optional(CONF_UNIT_OF_MEASUREMENT): cv.string,
         vol.Optional(CONF_STATE_CLASS): cv.string,
-        vol.Required(CONF_DATAPOINTS): [
+        vol.Optional(CONF_DATAPOINTS): [
             vol.ExactSequence([vol.Coerce(float), vol.Coerce(float)])
         ],
         vol.Optional(CONF_DEGREE, default=DEFAULT_DEGREE): vol.All(
@@ -69,13 +165,21 @@ CALIBRATION_SCHEMA = vol.Schema(
         ),
         vol.Optional(CONF_PRECISION, default=DEFAULT_PRECISION): cv.positive_int,
         vol.Optional(CONF_METHOD, default=DEFAULT_METHOD): vol.In(VALID_METHODS),
+        vol.Optional(CONF_EXPRESSION): valid_expression,
+        vol.Optional(CONF_CONSTANTS): {cv.string: vol.Coerce(float)},
     }
 )
 
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
-            {cv.slug: vol.All(CALIBRATION_SCHEMA, datapoints_greater_than_degree)}
+            {
+                cv.slug: vol.All(
+                    CALIBRATION_SCHEMA,
+                    datapoints_greater_than_degree,
+                    expression_matches_constants,
+                )
+            }
         )
     },
     extra=vol.ALLOW_EXTRA,
@@ -90,22 +194,39 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         _LOGGER.debug("Setup %s.%s", DOMAIN, calibration)
 
         degree = conf[CONF_DEGREE]
-
-        # Spline interpolation requires sorted x values
-        x_values, y_values = zip(*sorted(conf[CONF_DATAPOINTS]))
-
         method = conf[CONF_METHOD]
-        if method == "cubicspline":
-            cs = CubicSpline(x_values, y_values, bc_type="natural")
-            evaluator = lambda x: cs(x).item()
+
+        if method == "expression":
+            evaluator = _fit_expression(
+                conf[CONF_EXPRESSION],
+                conf.get(CONF_CONSTANTS, {}),
+                conf.get(CONF_DATAPOINTS, []),
+            )
         else:
-            # try to get valid coefficients for a polynomial
-            evaluator = Polynomial.fit(x_values, y_values, degree, domain=[])  # type: ignore
+            # Spline interpolation requires sorted x values
+            x_values, y_values = zip(*sorted(conf[CONF_DATAPOINTS]))
+
+            if method == "cubicspline":
+                cs = CubicSpline(x_values, y_values, bc_type="natural")
+                evaluator = lambda x: cs(x).item()
+            else:
+                # try to get valid coefficients for a polynomial
+                evaluator = Polynomial.fit(x_values, y_values, degree, domain=[])  # type: ignore
 
         data = {
-            k: v for k, v in conf.items() if k not in [CONF_DEGREE, CONF_DATAPOINTS, CONF_METHOD]
+            k: v
+            for k, v in conf.items()
+            if k
+            not in [
+                CONF_DEGREE,
+                CONF_DATAPOINTS,
+                CONF_METHOD,
+                CONF_EXPRESSION,
+                CONF_CONSTANTS,
+            ]
         }
         data[CONF_POLYNOMIAL] = evaluator
+        data[CONF_FINGERPRINT] = calibration_fingerprint(conf)
 
         hass.data[DATA_CALIBRATION][calibration] = data
 
@@ -120,3 +241,37 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         )
 
     return True
+
+
+def _fit_expression(
+    expression: str, constants: dict[str, float], datapoints: list
+) -> Callable[[float], float]:
+    """Fit the named constants to the data points and compile the expression.
+
+    If the fit fails, the configured constants are used as given.
+    """
+    if constants and datapoints:
+        func = compile_expression(expression, constants)
+        x_values, y_values = zip(*sorted(datapoints))
+
+        try:
+            fitted, _ = curve_fit(
+                lambda xs, *params: np.array([func(x, *params) for x in xs]),
+                x_values,
+                y_values,
+                p0=list(constants.values()),
+            )
+        except (RuntimeError, ValueError, TypeError, ArithmeticError) as err:
+            _LOGGER.warning(
+                "Unable to fit %s to %s, using configured %s %s: %s",
+                expression,
+                CONF_DATAPOINTS,
+                CONF_CONSTANTS,
+                constants,
+                err,
+            )
+        else:
+            constants = dict(zip(constants, fitted.tolist()))
+            _LOGGER.debug("Fitted %s constants: %s", expression, constants)
+
+    return compile_expression(expression, constants=constants)
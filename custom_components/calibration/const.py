@@ -11,10 +11,14 @@ CONF_HIDE_SOURCE = "hide_source"
 CONF_PRECISION = "precision"
 CONF_POLYNOMIAL = "polynomial"
 CONF_METHOD = "method"
+CONF_FINGERPRINT = "fingerprint"
+CONF_EXPRESSION = "expression"
+CONF_CONSTANTS = "constants"
 
 DATA_CALIBRATION = "calibration_data"
 
 ATTR_COEFFICIENTS = "coefficients"
+ATTR_CONSTANTS = "constants"
 ATTR_SOURCE = "source"
 ATTR_SOURCE_ATTRIBUTE = "source_attribute"
 ATTR_SOURCE_VALUE = "source_value"
@@ -24,4 +28,4 @@ DEFAULT_NAME = "Calibrated"
 DEFAULT_PRECISION = 2
 DEFAULT_METHOD = "polynomial"
 
-VALID_METHODS = ["polynomial", "cubicspline"]
+VALID_METHODS = ["polynomial", "cubicspline", "expression"]
@@ -0,0 +1,163 @@
+"""Safe arithmetic expressions for the Calibration integration."""
+
+from __future__ import annotations
+
+import ast
+import math
+from collections.abc import Callable, Iterable, Mapping
+from functools import lru_cache
+from typing import Any
+
+VARIABLE = "x"
+
+FUNCTIONS: dict[str, Any] = {
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "log": math.log,
+    "log10": math.log10,
+    "log2": math.log2,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "atan2": math.atan2,
+    "sinh": math.sinh,
+    "cosh": math.cosh,
+    "tanh": math.tanh,
+    "pi": math.pi,
+    "e": math.e,
+}
+
+# Minimum and maximum (None for unbounded) number of arguments per function
+_ARITY: dict[str, tuple[int, int | None]] = {
+    "abs": (1, 1),
+    "min": (2, None),
+    "max": (2, None),
+    "sqrt": (1, 1),
+    "exp": (1, 1),
+    "log": (1, 2),
+    "log10": (1, 1),
+    "log2": (1, 1),
+    "sin": (1, 1),
+    "cos": (1, 1),
+    "tan": (1, 1),
+    "asin": (1, 1),
+    "acos": (1, 1),
+    "atan": (1, 1),
+    "atan2": (2, 2),
+    "sinh": (1, 1),
+    "cosh": (1, 1),
+    "tanh": (1, 1),
+}
+
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Call,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.UAdd,
+    ast.USub,
+)
+
+
+@lru_cache(maxsize=None)
+def parse_expression(expression: str) -> ast.Expression:
+    """Parse and validate an arithmetic expression in x."""
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as err:
+        raise ValueError(f"invalid syntax in '{expression}'") from err
+
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"'{type(node).__name__}' is not allowed in expressions")
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(
+                node.value, (int, float)
+            ):
+                raise ValueError(f"'{node.value!r}' is not a number")
+            # Integer powers are unbounded, floats overflow cleanly instead
+            try:
+                node.value = float(node.value)
+            except OverflowError as err:
+                raise ValueError(f"'{node.value}' is out of range") from err
+        elif isinstance(node, ast.Call):
+            if (
+                not isinstance(node.func, ast.Name)
+                or node.func.id not in _ARITY
+                or node.keywords
+            ):
+                raise ValueError(f"unsupported function call in '{expression}'")
+            low, high = _ARITY[node.func.id]
+            if len(node.args) < low or (high is not None and len(node.args) > high):
+                raise ValueError(
+                    f"wrong number of arguments to '{node.func.id}' in '{expression}'"
+                )
+
+    return tree
+
+
+def compile_expression(
+    expression: str,
+    parameters: Iterable[str] = (),
+    constants: Mapping[str, float] | None = None,
+) -> Callable[..., float]:
+    """Compile an expression into a function of x followed by the parameters.
+
+    Names that are neither x, a parameter, a constant nor a supported function
+    are rejected, so the compiled function cannot reach anything else.
+    """
+    parameters = list(parameters)
+    constants = dict(constants or {})
+
+    for name in (*parameters, *constants):
+        if (
+            not name.isidentifier()
+            or name.startswith("_")
+            or name == VARIABLE
+            or name in FUNCTIONS
+        ):
+            raise ValueError(f"'{name}' cannot be used as a constant name")
+
+    tree = parse_expression(expression)
+    known = {VARIABLE, *parameters, *constants, *FUNCTIONS}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id not in known:
+            raise ValueError(f"unknown name '{node.id}' in '{expression}'")
+
+    func = ast.Expression(
+        body=ast.Lambda(
+            args=ast.arguments(
+                posonlyargs=[],
+                args=[ast.arg(arg=name) for name in (VARIABLE, *parameters)],
+                kwonlyargs=[],
+                kw_defaults=[],
+                defaults=[],
+            ),
+            body=tree.body,
+        )
+    )
+    ast.fix_missing_locations(func)
+
+    code = compile(func, "<expression>", "eval")
+    evaluator = eval(  # pylint: disable=eval-used
+        code, {"__builtins__": {}, **FUNCTIONS, **constants}
+    )
+    evaluator.expression = expression
+    evaluator.constants = constants
+    return evaluator
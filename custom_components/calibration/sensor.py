@@ -3,9 +3,15 @@
 from __future__ import annotations
 
 import logging
+import math
+from dataclasses import dataclass
 from typing import cast, Any
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorDeviceClass,
+    SensorExtraStoredData,
+)
 from homeassistant.components.sensor.const import ATTR_STATE_CLASS, CONF_STATE_CLASS
 from homeassistant.const import (
     ATTR_DEVICE_CLASS,
@@ -39,10 +45,12 @@ from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
 from .const import (
     ATTR_COEFFICIENTS,
+    ATTR_CONSTANTS,
     ATTR_SOURCE,
     ATTR_SOURCE_ATTRIBUTE,
     ATTR_SOURCE_VALUE,
     CONF_CALIBRATION,
+    CONF_FINGERPRINT,
     CONF_HIDE_SOURCE,
     CONF_POLYNOMIAL,
     CONF_PRECISION,
@@ -95,6 +103,7 @@ async def async_setup_platform(  # pylint: disable=too-many-locals
                 attribute,
                 conf[CONF_PRECISION],
                 conf[CONF_POLYNOMIAL],
+                conf[CONF_FINGERPRINT],
                 units,
                 device_class,
                 state_class,
@@ -103,7 +112,43 @@ async def async_setup_platform(  # pylint: disable=too-many-locals
     )
 
 
-class CalibrationSensor(SensorEntity):  # pylint: disable=too-many-instance-attributes
+@dataclass
+class CalibrationSensorExtraStoredData(SensorExtraStoredData):
+    """Object to hold extra stored data for a Calibration sensor."""
+
+    source_value: float | None
+    fingerprint: str | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the Calibration sensor data."""
+        data = super().as_dict()
+        data["source_value"] = self.source_value
+        data["fingerprint"] = self.fingerprint
+        return data
+
+    @classmethod
+    def from_dict(
+        cls, restored: dict[str, Any]
+    ) -> CalibrationSensorExtraStoredData | None:
+        """Initialize stored Calibration sensor data from a dict."""
+        if (sensor_data := SensorExtraStoredData.from_dict(restored)) is None:
+            return None
+
+        try:
+            source_value = restored["source_value"]
+            fingerprint = restored["fingerprint"]
+        except KeyError:
+            return None
+
+        return cls(
+            sensor_data.native_value,
+            sensor_data.native_unit_of_measurement,
+            source_value,
+            fingerprint,
+        )
+
+
+class CalibrationSensor(RestoreSensor):  # pylint: disable=too-many-instance-attributes
     """Representation of a Calibration sensor."""
 
     def __init__(
@@ -114,6 +159,7 @@ class CalibrationSensor(SensorEntity):  # pylint: disable=too-many-instance-attr
         attribute: str | None,
         precision: int,
         polynomial,
+        fingerprint: str,
         unit_of_measurement: str | None,
         device_class: str | None,
         state_class: str | None,
@@ -123,6 +169,8 @@ class CalibrationSensor(SensorEntity):  # pylint: disable=too-many-instance-attr
         self._source_attribute = attribute
         self._precision = precision
         self._poly = polynomial
+        self._fingerprint = fingerprint
+        self._last_error: str | None = None
 
         self._attr_unique_id = unique_id
         self._attr_name = name
@@ -136,14 +184,47 @@ class CalibrationSensor(SensorEntity):  # pylint: disable=too-many-instance-attr
             ATTR_SOURCE: source,
             ATTR_SOURCE_ATTRIBUTE: attribute,
             ATTR_COEFFICIENTS: polynomial.coef.tolist() if hasattr(polynomial, "coef") else [],
+            ATTR_CONSTANTS: getattr(polynomial, "constants", None),
             ATTR_STATE_CLASS: state_class,
         }
         self._attr_extra_state_attributes = {
             k: v for k, v in attrs.items() if v or k == ATTR_SOURCE_VALUE
         }
 
+    @property
+    def extra_restore_state_data(self) -> CalibrationSensorExtraStoredData:
+        """Return sensor specific state data to be restored."""
+        return CalibrationSensorExtraStoredData(
+            self.native_value,
+            self.native_unit_of_measurement,
+            self._attr_extra_state_attributes[ATTR_SOURCE_VALUE],
+            self._fingerprint,
+        )
+
     async def async_added_to_hass(self) -> None:
         """Handle added to Hass."""
+        await super().async_added_to_hass()
+
+        # Only trust the restored value if it was produced by the same model
+        if (
+            (last_extra_data := await self.async_get_last_extra_data()) is not None
+            and (
+                last_data := CalibrationSensorExtraStoredData.from_dict(
+                    last_extra_data.as_dict()
+                )
+            )
+            is not None
+            and last_data.fingerprint == self._fingerprint
+        ):
+            self._attr_native_value = last_data.native_value
+            self._attr_extra_state_attributes[ATTR_SOURCE_VALUE] = (
+                last_data.source_value
+            )
+            if self._attr_native_unit_of_measurement is None:
+                self._attr_native_unit_of_measurement = (
+                    last_data.native_unit_of_measurement
+                )
+
         if (state := self.hass.states.get(self._source_entity_id)) is not None:
             self._update_state(state)
 
@@ -195,7 +276,6 @@ class CalibrationSensor(SensorEntity):  # pylint: disable=too-many-instance-attr
 
         try:
             source_value = float(source_value)
-            native_value = round(self._poly(source_value), self._precision)
         except (ValueError, TypeError):
             source_value = native_value = None
             if self._source_attribute:
@@ -206,8 +286,29 @@ class CalibrationSensor(SensorEntity):  # pylint: disable=too-many-instance-attr
                 )
             else:
                 _LOGGER.debug("%s state is not numerical", self._source_entity_id)
+        else:
+            try:
+                result = self._poly(source_value)
+                if not math.isfinite(result):
+                    raise ValueError(f"result {result} is not finite")
+                native_value = round(result, self._precision)
+            except (ValueError, TypeError, ArithmeticError) as err:
+                native_value = None
+                # Only warn once per distinct error to avoid flooding the log
+                if str(err) != self._last_error:
+                    self._last_error = str(err)
+                    _LOGGER.warning(
+                        "CalibrationSensor(%s) unable to evaluate %s "
+                        "for source value %s: %s",
+                        self.name,
+                        getattr(self._poly, "expression", "calibration"),
+                        source_value,
+                        err,
+                    )
+            else:
+                self._last_error = None
 
-        #self._attr_extra_state_attributes[ATTR_SOURCE_VALUE] = source_value
+        self._attr_extra_state_attributes[ATTR_SOURCE_VALUE] = source_value
         self._attr_native_value = native_value
 
         self.async_write_ha_state()
@@ -1,4 +1,6 @@
 """The tests for the integration sensor platform."""
+from unittest.mock import patch
+
 import pytest
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.const import (
@@ -10,21 +12,27 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED,
     STATE_UNKNOWN,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers import entity_registry
 from homeassistant.helpers.entity_registry import RegistryEntryHider
 from homeassistant.setup import async_setup_component
 from pytest import LogCaptureFixture
+from pytest_homeassistant_custom_component.common import (
+    mock_restore_cache_with_extra_data,
+)
 from voluptuous.error import MultipleInvalid
 
-from custom_components.calibration import CONFIG_SCHEMA
+from custom_components.calibration import CONFIG_SCHEMA, calibration_fingerprint
 from custom_components.calibration.const import (
+    CONF_CONSTANTS,
     CONF_DATAPOINTS,
     CONF_DEGREE,
+    CONF_EXPRESSION,
+    CONF_METHOD,
     CONF_PRECISION,
     DOMAIN,
 )
-from custom_components.calibration.sensor import ATTR_COEFFICIENTS
+from custom_components.calibration.sensor import ATTR_COEFFICIENTS, ATTR_SOURCE_VALUE
 
 
 async def test_linear_state(hass: HomeAssistant, caplog: LogCaptureFixture):
@@ -289,3 +297,358 @@ async def test_invalid_config(hass: HomeAssistant, caplog: LogCaptureFixture):
         "expected float @ data['calibration']['test']['data_points'][1]. Got [2.0, 'a']."
         in caplog.text
     )
+
+
+async def test_restore_state(hass: HomeAssistant):
+    """Test calibration sensor restores its last value on startup."""
+    config = {
+        DOMAIN: {
+            "test": {
+                CONF_SOURCE: "sensor.uncalibrated",
+                CONF_DATAPOINTS: [
+                    [1.0, 2.0],
+                    [2.0, 3.0],
+                ],
+                CONF_PRECISION: 2,
+                CONF_UNIT_OF_MEASUREMENT: "a",
+            }
+        }
+    }
+    fingerprint = calibration_fingerprint(CONFIG_SCHEMA(config)[DOMAIN]["test"])
+    mock_restore_cache_with_extra_data(
+        hass,
+        (
+            (
+                State("sensor.test", "5.0"),
+                {
+                    "native_value": 5.0,
+                    "native_unit_of_measurement": "a",
+                    "source_value": 4.0,
+                    "fingerprint": fingerprint,
+                },
+            ),
+        ),
+    )
+
+    assert await async_setup_component(hass, DOMAIN, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test")
+    assert state is not None
+    assert float(state.state) == 5.0
+    assert state.attributes.get(ATTR_SOURCE_VALUE) == 4.0
+
+    hass.states.async_set("sensor.uncalibrated", 6, {})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test")
+    assert float(state.state) == 7.0
+    assert state.attributes.get(ATTR_SOURCE_VALUE) == 6.0
+
+
+async def test_restore_state_fingerprint_mismatch(hass: HomeAssistant):
+    """Test calibration sensor ignores a value restored from another model."""
+    config = {
+        DOMAIN: {
+            "test": {
+                CONF_SOURCE: "sensor.uncalibrated",
+                CONF_DATAPOINTS: [
+                    [1.0, 2.0],
+                    [2.0, 3.0],
+                ],
+                CONF_PRECISION: 2,
+            }
+        }
+    }
+    mock_restore_cache_with_extra_data(
+        hass,
+        (
+            (
+                State("sensor.test", "5.0"),
+                {
+                    "native_value": 5.0,
+                    "native_unit_of_measurement": None,
+                    "source_value": 4.0,
+                    "fingerprint": "stale",
+                },
+            ),
+        ),
+    )
+
+    assert await async_setup_component(hass, DOMAIN, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test")
+    assert state is not None
+    assert state.state == STATE_UNKNOWN
+
+
+async def test_expression_state(hass: HomeAssistant):
+    """Test expression calibration sensor with fixed constants."""
+    config = {
+        DOMAIN: {
+            "test": {
+                CONF_SOURCE: "sensor.uncalibrated",
+                CONF_METHOD: "expression",
+                CONF_EXPRESSION: "(x - offset) * 9 / 5 + 32",
+                CONF_CONSTANTS: {"offset": 1.5},
+                CONF_PRECISION: 1,
+            }
+        }
+    }
+    assert await async_setup_component(hass, DOMAIN, config)
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.uncalibrated", 21.5, {})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test")
+    assert state is not None
+    assert float(state.state) == 68.0
+
+    hass.states.async_set("sensor.uncalibrated", 1.5, {})
+    await hass.async_block_till_done()
+
+    assert float(hass.states.get("sensor.test").state) == 32.0
+
+
+async def test_expression_fit_constants(
+    hass: HomeAssistant, caplog: LogCaptureFixture
+):
+    """Test expression calibration sensor fits constants to data points."""
+    config = {
+        DOMAIN: {
+            "test": {
+                CONF_SOURCE: "sensor.uncalibrated",
+                CONF_METHOD: "expression",
+                CONF_EXPRESSION: "a * log(x) + b",
+                CONF_CONSTANTS: {"a": 1.0, "b": 0.0},
+                CONF_DATAPOINTS: [
+                    [1.0, 3.0],
+                    [10.0, 3.0 + 2.0 * 2.302585],
+                    [100.0, 3.0 + 2.0 * 4.605170],
+                ],
+                CONF_PRECISION: 2,
+            }
+        }
+    }
+    assert await async_setup_component(hass, DOMAIN, config)
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.uncalibrated", 1000.0, {})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test")
+    assert state is not None
+    assert float(state.state) == 16.82
+
+    constants = {k: round(v, 2) for k, v in state.attributes["constants"].items()}
+    assert constants == {"a": 2.0, "b": 3.0}
+
+    hass.states.async_set("sensor.uncalibrated", -1.0, {})
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.test").state == STATE_UNKNOWN
+    assert (
+        "unable to evaluate a * log(x) + b for source value -1.0: math domain error"
+        in caplog.text
+    )
+    assert "state is not numerical" not in caplog.text
+
+
+async def test_expression_not_finite(
+    hass: HomeAssistant, caplog: LogCaptureFixture
+):
+    """Test expression results that are not finite are not published."""
+    config = {
+        DOMAIN: {
+            "test": {
+                CONF_SOURCE: "sensor.uncalibrated",
+                CONF_METHOD: "expression",
+                CONF_EXPRESSION: "x * 1e300",
+            }
+        }
+    }
+    assert await async_setup_component(hass, DOMAIN, config)
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.uncalibrated", 1e10, {})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test")
+    assert state is not None
+    assert state.state == STATE_UNKNOWN
+    assert "result inf is not finite" in caplog.text
+
+
+async def test_expression_fit_fails(
+    hass: HomeAssistant, caplog: LogCaptureFixture
+):
+    """Test expression calibration falls back to configured constants."""
+    config = {
+        DOMAIN: {
+            "test": {
+                CONF_SOURCE: "sensor.uncalibrated",
+                CONF_METHOD: "expression",
+                CONF_EXPRESSION: "a * x + b",
+                CONF_CONSTANTS: {"a": 2.0, "b": 1.0},
+                CONF_DATAPOINTS: [
+                    [1.0, 2.0],
+                    [2.0, 3.0],
+                ],
+                CONF_PRECISION: 2,
+            }
+        }
+    }
+    with patch(
+        "custom_components.calibration.curve_fit",
+        side_effect=RuntimeError("Optimal parameters not found"),
+    ):
+        assert await async_setup_component(hass, DOMAIN, config)
+        await hass.async_block_till_done()
+
+    assert "Unable to fit a * x + b to data_points" in caplog.text
+
+    hass.states.async_set("sensor.uncalibrated", 4.0, {})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test")
+    assert state is not None
+    assert float(state.state) == 9.0
+
+
+@pytest.mark.parametrize(
+    ("expression", "match"),
+    [
+        ("__import__('os').system('true')", "invalid expression"),
+        ("x.real", "invalid expression"),
+        ("x + y", "unknown name 'y'"),
+        ("sqrt(x, 2)", "wrong number of arguments to 'sqrt'"),
+        ("atan2(x)", "wrong number of arguments to 'atan2'"),
+        ("max(x)", "wrong number of arguments to 'max'"),
+        ("(-8) ** (1/3)", "is not a real number"),
+        ("1" + "0" * 400, "is out of range"),
+        ("1e400 * x", "is not a real number"),
+    ],
+)
+async def test_invalid_expression(expression: str, match: str):
+    """Test unsafe or unknown expressions are rejected."""
+    config = {
+        DOMAIN: {
+            "test": {
+                CONF_SOURCE: "sensor.uncalibrated",
+                CONF_METHOD: "expression",
+                CONF_EXPRESSION: expression,
+            }
+        }
+    }
+
+    with pytest.raises(MultipleInvalid, match=match):
+        CONFIG_SCHEMA(config)
+
+
+async def test_datapoints_required(hass: HomeAssistant, caplog: LogCaptureFixture):
+    """Test data points are required for the polynomial method."""
+    config = {
+        DOMAIN: {
+            "test": {
+                CONF_SOURCE: "sensor.uncalibrated",
+            }
+        }
+    }
+    assert not await async_setup_component(hass, DOMAIN, config)
+    assert (
+        "required key not provided @ data['calibration']['test']['data_points']"
+        in caplog.text
+    )
+
+
+@pytest.mark.parametrize(
+    ("settings", "match"),
+    [
+        (
+            {CONF_EXPRESSION: "x + 1", CONF_DATAPOINTS: [[1.0, 2.0], [2.0, 3.0]]},
+            "expression is only valid for method expression",
+        ),
+        (
+            {
+                CONF_METHOD: "cubicspline",
+                CONF_CONSTANTS: {"a": 1.0},
+                CONF_DATAPOINTS: [[1.0, 2.0], [2.0, 3.0]],
+            },
+            "constants is only valid for method expression",
+        ),
+        (
+            {
+                CONF_METHOD: "expression",
+                CONF_EXPRESSION: "x + 1",
+                CONF_DATAPOINTS: [[1.0, 2.0], [2.0, 3.0]],
+            },
+            "data_points requires constants to fit for method expression",
+        ),
+        (
+            {
+                CONF_METHOD: "expression",
+                CONF_EXPRESSION: "a * x ** 2 + b * x + c",
+                CONF_CONSTANTS: {"a": 1.0, "b": 1.0, "c": 0.0},
+                CONF_DATAPOINTS: [[1.0, 2.0], [2.0, 3.0]],
+            },
+            "data_points must have at least 3 data_points",
+        ),
+        (
+            {
+                CONF_METHOD: "expression",
+                CONF_EXPRESSION: "x + __builtins__",
+                CONF_CONSTANTS: {"__builtins__": 1.0},
+            },
+            "'__builtins__' cannot be used as a constant name",
+        ),
+    ],
+)
+async def test_expression_settings_mismatch(settings: dict, match: str):
+    """Test expression settings that would be ignored are rejected."""
+    config = {DOMAIN: {"test": {CONF_SOURCE: "sensor.uncalibrated", **settings}}}
+
+    with pytest.raises(MultipleInvalid, match=match):
+        CONFIG_SCHEMA(config)
+
+
+async def test_restore_state_source_changed(hass: HomeAssistant):
+    """Test calibration sensor ignores a value restored from another source."""
+    config = {
+        DOMAIN: {
+            "test": {
+                CONF_SOURCE: "sensor.uncalibrated",
+                CONF_DATAPOINTS: [
+                    [1.0, 2.0],
+                    [2.0, 3.0],
+                ],
+                CONF_PRECISION: 2,
+            }
+        }
+    }
+    old_config = {
+        DOMAIN: {"test": {**config[DOMAIN]["test"], CONF_SOURCE: "sensor.old"}}
+    }
+    fingerprint = calibration_fingerprint(CONFIG_SCHEMA(old_config)[DOMAIN]["test"])
+    mock_restore_cache_with_extra_data(
+        hass,
+        (
+            (
+                State("sensor.test", "5.0"),
+                {
+                    "native_value": 5.0,
+                    "native_unit_of_measurement": None,
+                    "source_value": 4.0,
+                    "fingerprint": fingerprint,
+                },
+            ),
+        ),
+    )
+
+    assert await async_setup_component(hass, DOMAIN, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.test")
+    assert state is not None
+    assert state.state == STATE_UNKNOWN